@@ -30,6 +30,11 @@ import sys
 from demo_utils import *
 
 
+# NOTE: The Generator API is faster than the legacy `np.random` functions and
+# can fill pre-allocated buffers in place.
+rng = np.random.default_rng()
+
+
 def demo_image_viewer():
     img_test = cv2.imread("sample-media/checkboard_non_planar.png").astype(np.uint8)
     img_test = norm_uint8(cv2.cvtColor(img_test, cv2.COLOR_BGR2GRAY))
@@ -43,7 +48,7 @@ def demo_image_viewer():
     # computation, making it slower by comparison).
     img_test_small = img_test.copy()
     img_test = resize_by_ratio(img_test, 10)
-    noise_image = np.random.randn(*(img_test.shape)).astype(np.int8)  # pyright: ignore
+    noise_image = rng.standard_normal(img_test.shape, dtype=np.float32).astype(np.int8)
 
     # IMPORTANT: Specifying a kwargs parameter allows the function interface to
     # remain generic which is an important quality for any callbacks associated
@@ -55,16 +60,53 @@ def demo_image_viewer():
     # these variables, then this kwargs variable specification will save you
     # some typing.
 
+    # NOTE: Scaling the noise only depends on sigma, so the product is cached
+    # and reused for as long as sigma remains unchanged (e.g. when only the
+    # resize slider moves). Only the most recent value is held since each
+    # entry is as large as the up-scaled image. The product is truncated to
+    # int16 (as the fused kernel does) so the result stays int16 even though
+    # the sigma trackbar produces floats.
+    noise_cache = {}
+
+    def scaled_noise(sigma):
+        scaled = noise_cache.get(sigma)
+        if scaled is None:
+            noise_cache.clear()
+            scaled = np.multiply(noise_image, sigma, dtype=np.float32).astype(np.int16)
+            noise_cache[sigma] = scaled
+        return scaled
+
+    # NOTE: When numba is installed, the resize, noise scaling, and addition
+    # are fused into a single parallel pass over a reused output buffer rather
+    # than three separate passes over freshly allocated arrays.
+    fused_cache = {}
+    fused_cache_small = {}
+
+    # NOTE: Otherwise, the cached (pre-scaled) noise is added to the image in
+    # a single pass written straight into a reused buffer, rather than
+    # allocating a new array for the result on every frame.
+    resize_cache = {}
+    blend_cache = {}
+    blend_cache_small = {}
+
+    def blend_into(cache, image, scaled):
+        out = reuse_buffer(cache, image.shape, np.int16)
+        return np.add(image, scaled[: image.shape[0], : image.shape[1]], out=out)
+
     def callback_0(rho, sigma, **_):
-        resized = resize_by_ratio(img_test, rho)
-        noise_slice = noise_image[: resized.shape[0], : resized.shape[1]]
-        result = resized + (noise_slice * sigma)
-        return result
+        if fused_resize_blend is not None:
+            out = reuse_buffer(fused_cache, ratio_shape(img_test.shape, rho), np.int16)
+            return fused_resize_blend(img_test, noise_image, rho, sigma, out)
+
+        resized = resize_into(img_test, rho, resize_cache)
+        return blend_into(blend_cache, resized, scaled_noise(sigma))
 
     def callback_1(sigma, **_):
-        noise_slice = noise_image[: img_test_small.shape[0], : img_test_small.shape[1]]
-        result = img_test_small + (noise_slice * sigma)
-        return result
+        if fused_resize_blend is not None:
+            out = reuse_buffer(fused_cache_small, img_test_small.shape, np.int16)
+            return fused_resize_blend(img_test_small, noise_image, 1.0, sigma, out)
+
+        return blend_into(blend_cache_small, img_test_small, scaled_noise(sigma))
 
     # define the viewer interface and run the application
     # happy tuning / visualizing!
@@ -116,16 +158,56 @@ def demo_static_image_viewer():
 
 # An example to showcase various plotting features
 def demo_plot_viewer():
-    def callback(nsamples, sigma, omega, phasem, animation_tick, **_):
-        cphase = (animation_tick / (2 * np.pi)) * phasem
-        sinusoid = np.sin((np.linspace(0, omega * 2 * np.pi, nsamples) + cphase))
-        noise = np.random.randn(nsamples)
-        result = sinusoid + (noise[:nsamples] * sigma)
-        waves = 5
-        return np.array([result] * waves) + (np.arange(waves).reshape(-1, 1) - ((waves - 1) / 2))
+    max_samples = 1000
+    waves = 5
+    offsets = np.arange(waves).reshape(-1, 1) - ((waves - 1) / 2)
+
+    # NOTE: The sample positions only depend on omega and nsamples, not on the
+    # animation tick, so they're computed once per pair and shared (read-only)
+    # by both panes. The cache is cleared once it grows past a small bound.
+    linspace_cache = {}
+
+    def sample_positions(omega, nsamples):
+        key = (omega, nsamples)
+        base = linspace_cache.get(key)
+        if base is None:
+            if len(linspace_cache) >= 100:
+                linspace_cache.clear()
+            base = np.linspace(0, omega * 2 * np.pi, nsamples)
+            linspace_cache[key] = base
+        return base
+
+    # NOTE: Callbacks executed at high frame rates benefit from avoiding
+    # allocations altogether. Here, buffers large enough for the maximum number
+    # of samples are allocated once and every operation writes its result into
+    # a view of them. Each pane receives its own set of buffers since a plot
+    # holds onto the returned data until it's repainted.
+    def create_callback():
+        buf_sin = np.empty(max_samples)
+        buf_noise = np.empty(max_samples)
+        buf_out = np.empty((waves, max_samples))
+
+        def callback(nsamples, sigma, omega, phasem, animation_tick, **_):
+            cphase = (animation_tick / (2 * np.pi)) * phasem
+            sinusoid = buf_sin[:nsamples]
+            np.add(sample_positions(omega, nsamples), cphase, out=sinusoid)
+            np.sin(sinusoid, out=sinusoid)
+            noise = buf_noise[:nsamples]
+            rng.standard_normal(out=noise)
+            np.multiply(noise, sigma, out=noise)
+            np.add(sinusoid, noise, out=sinusoid)
+            # NOTE: Broadcasting the wave against the column of offsets writes
+            # each shifted copy straight into the output buffer. Tiling the wave
+            # beforehand (e.g. `np.array([sinusoid] * waves)`) would copy it to
+            # memory once per wave only for the copies to be overwritten.
+            result = buf_out[:, :nsamples]
+            np.add(sinusoid, offsets, out=result)
+            return result
+
+        return callback
 
     viewer = Viewer(title="Multiple Plots: A Visual Illustration of Signal Aliasing")
-    trackbar_n = ParameterTrackbar("nsamples", 100, 1000, 100)
+    trackbar_n = ParameterTrackbar("nsamples", 100, max_samples, 100)
     trackbar_omega = ParameterTrackbar("omega", 1, 50, init=50)
     trackbar_sigma = ParameterTrackbar("sigma", 0, 3, 0.1)
     trackbar_phasem = ParameterTrackbar("phasem", 0.1, 10, 0.1, init=0.1)
@@ -147,7 +229,7 @@ def demo_plot_viewer():
     # fillLevel, which causes the area under any curve to be shaded between the
     # curve and this value. The default value is None which results in the area
     # under the curve not being shaded.
-    pl = Plot2DLinePane(callback, ncolors=3, cmap="plasma", line_width=1, fillLevel=None)  # 0)
+    pl = Plot2DLinePane(create_callback(), ncolors=3, cmap="plasma", line_width=1, fillLevel=None)  # 0)
     pl.set_title("Signal Aliasing: Labeled Graph")
     pl.set_xlabel("Sample Number")
     pl.set_ylabel("Amplitude")
@@ -168,7 +250,7 @@ def demo_plot_viewer():
     # as well as the kind of symbol drawn.
     # For a full list of symbols, visit the documentation for PyQtGraph and
     # review their resouces for scatter plots.
-    ps = Animator(fps=60, contents=Plot2DScatterPane(callback, symbolSize=10, symbol="t", ncolors=2)).animation_content
+    ps = Animator(fps=60, contents=Plot2DScatterPane(create_callback(), symbolSize=10, symbol="t", ncolors=2)).animation_content
 
     # IMPORTANT: Rendering multiple animations does not occur simultaneously,
     # at least not yet. Use caution if you are animating many windows at the
@@ -183,11 +265,23 @@ def demo_plot_viewer():
 
 def demo_3d_prototype():
 
+    # NOTE: The surface only depends on sigma and the tick only selects one of
+    # 500 scales of it, so all 500 scaled surfaces are computed at once when
+    # sigma changes (roughly 800 KB) and each animation tick merely indexes
+    # into them. Only the stack for the most recent sigma is held.
+    scales = np.arange(1, 501, dtype=np.float32).reshape(-1, 1, 1) * 10
+    surface_cache = {}
+
     def callback(animation_tick, sigma, **_):
-        gaussian = cv2.getGaussianKernel(20, sigma=sigma)
-        gaussian = gaussian * gaussian.T  # pyright: ignore
-        gaussian = gaussian / np.sum(gaussian)
-        return gaussian * ((animation_tick % 500) + 1) * 10
+        surfaces = surface_cache.get(sigma)
+        if surfaces is None:
+            kernel = cv2.getGaussianKernel(20, sigma=sigma)
+            gaussian = kernel @ kernel.T  # pyright: ignore
+            gaussian = (gaussian / np.sum(gaussian)).astype(np.float32)
+            surfaces = gaussian * scales
+            surface_cache.clear()
+            surface_cache[sigma] = surfaces
+        return surfaces[animation_tick % len(scales)]
 
     viewer = Viewer("Deprecated 3D prototype. We will soon integrate with PyVista for 3D data display features")
     animator = Animator(fps=60, contents=Plot3DPane(callback))
@@ -218,7 +312,7 @@ def demo_pvt3dplotter_prototype():
 
     def callback(**_):
         sigma = 1e-3
-        noise = np.random.normal(loc=0, scale=sigma, size=np.prod(sphere.points.shape))
+        noise = rng.normal(loc=0, scale=sigma, size=np.prod(sphere.points.shape))
         sphere.points += noise.reshape(*sphere.points.shape)
 
     plotter = Pvt3DPlotPane(callback=callback)
@@ -4,6 +4,25 @@ import os
 from typing import Callable
 
 
+def performance_log_enabled():
+    """
+    Return whether performance logging was requested via the associated
+    environment variable.
+    """
+    return os.getenv("VIEWER_PERF_LOG") == "1"
+
+
+def log_event(identifier: str, event: str, message: str):
+    """
+    Print a performance log entry in the format shared by all events.
+
+    :param identifier: identifier of the pane which produced the event
+    :param event: short name of the event
+    :param message: event specific details
+    """
+    print(f"identifier: {identifier.ljust(30)} event: {event.ljust(10)} {message}")
+
+
 def performance_log(event: str):
     """
     Attached to a defined function to wrap with a performance logging feature.
@@ -22,17 +41,18 @@ def performance_log(event: str):
 
         epsilon = 1e-9
 
-        if not os.getenv("VIEWER_PERF_LOG") == "1":
+        if not performance_log_enabled():
             return func
 
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            identifier = self.identifier
             start = time.time()
             result = func(self, *args, **kwargs)
             elapsed = time.time() - start
-            print(
-                f"identifier: {identifier.ljust(30)} event: {event.ljust(10)} processing time (s): {elapsed:010.07f} max possible fps: {1 / (elapsed + epsilon): 015.07f}"
+            log_event(
+                self.identifier,
+                event,
+                f"processing time (s): {elapsed:010.07f} max possible fps: {1 / (elapsed + epsilon): 015.07f}",
             )
             return result
 
@@ -1,12 +1,13 @@
 from PySide6 import QtGui
+from PySide6.QtCore import QRunnable, QThreadPool, QTimer, Qt, Signal
 from numpy.typing import NDArray
 from pyqtgraph import GraphicsLayoutWidget, LayoutWidget, PlotDataItem
 from pyqtgraph.colormap import ColorMap
-from pvt.decorators import performance_log
+from pvt.decorators import log_event, performance_log, performance_log_enabled
 from pvt.identifier import IdManager
-from pvt.state import State
+from pvt.state import ResultCache, State
 from pvt.widgets import StatefulWidget
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import numpy as np
 import pyqtgraph as pg
 import pyqtgraph.opengl as pggl
@@ -14,6 +15,32 @@ from PySide6.QtWidgets import QLabel, QSizePolicy
 from pyvistaqt import BackgroundPlotter
 
 
+class ComputeTask(QRunnable):
+    """
+    A unit of work which executes the callback of a pane on a worker thread
+    and hands the result back to the pane. Exists to support the `threaded`
+    option of `StatefulPane` and is not intended to be used by user code.
+    """
+
+    def __init__(self, pane: "StatefulPane", kwargs: Dict) -> None:
+        """
+        :param pane: the pane to compute the data for
+        :param kwargs: the state passed to the pane callback
+        """
+        super().__init__()
+        self.pane = pane
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            data = self.pane.compute_data(**self.kwargs)
+        except BaseException:
+            # release the pane such that later updates aren't dropped forever
+            self.pane.abandoned.emit()
+            raise
+        self.pane.computed.emit(data)
+
+
 class StatefulPane(LayoutWidget):
     """
     A simple pane/panel class that holds some state used for event handling /
@@ -32,24 +59,77 @@ class StatefulPane(LayoutWidget):
     allows a common state to be shared among all data display panes and allows
     for a state change within a control widget to be reflected across all
     related data display panes (i.e. no need for duplicate control widgets).
+
+    IMPORTANT: When the `threaded` option is enabled, the callback is executed
+    on a worker thread. Such callbacks must not touch any Qt objects and must
+    return new data rather than modifying data which may still be displayed.
+
+    NOTE: Updates requested while the pane is still busy with a previous one
+    (e.g. an animation tick arriving before a slow callback has finished) are
+    dropped rather than queued. Only the most recent of the dropped requests
+    is kept and executed once the pane is free again, so the display never
+    falls behind the current state.
     """
 
+    computed = Signal(object)
+    abandoned = Signal()
+
     pane_state: State
     callback: Callable
     identifier: str
+    flush_timer: QTimer
+    threaded: bool
+    busy: bool
+    pending: Optional[Dict]
+    dropped: int
 
-    def __init__(self, callback: Optional[Callable] = None, **kwargs) -> None:
+    def __init__(
+        self,
+        callback: Optional[Callable] = None,
+        flush_interval: Optional[int] = 8,
+        threaded: bool = False,
+        memoize: int = 0,
+        **kwargs,
+    ) -> None:
         """
         Initialize an instance of the class.
 
         :param callback: A callback to update the rendered data.
+        :param flush_interval: Minimum number of milliseconds between updates
+        caused by control widget changes. Changes arriving within the interval
+        are coalesced, so a burst of changes (e.g. dragging a slider) updates
+        the pane at most once per interval with the most recent state rather
+        than producing a backlog of stale renders. Specify `None` to update
+        immediately on every change.
+        :param threaded: A flag which specifies whether the callback is executed
+        on a worker thread, keeping the interface responsive while the data is
+        computed. Results are rendered on the GUI thread and, as with any
+        update, requests made while a computation is in progress are dropped
+        in favor of the most recent one.
+        :param memoize: The number of recent callback results to reuse when
+        the same state is seen again (see `ResultCache`). Only enable for
+        callbacks which are free of side effects and return new data on each
+        call. Specify 0 to execute the callback on every update.
         """
         assert callback is not None
         super().__init__(**kwargs)
         self.identifier = f"{self.__class__.__name__}-{IdManager().generate_identifier()}".lower()
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)  # pyright: ignore
-        self.callback = callback
-        self.pane_state = State(self.update)
+        self.callback = callback if memoize <= 0 else ResultCache(callback, maxsize=memoize)
+        self.flush_timer = QTimer(parent=self)
+        self.flush_timer.setSingleShot(True)
+        scheduler = None
+        if flush_interval is not None:
+            self.flush_timer.setInterval(flush_interval)
+            scheduler = self.schedule_flush
+        self.pane_state = State(self.update, scheduler=scheduler)
+        self.flush_timer.timeout.connect(self.force_flush)
+        self.threaded = threaded
+        self.busy = False
+        self.pending = None
+        self.dropped = 0
+        self.computed.connect(self.on_computed, Qt.QueuedConnection)  # pyright: ignore
+        self.abandoned.connect(self.release, Qt.QueuedConnection)  # pyright: ignore
         self.identifier_label = QLabel(self.identifier)
         self.identifier_label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)  # pyright: ignore
         self.addWidget(self.identifier_label)
@@ -62,18 +142,65 @@ class StatefulPane(LayoutWidget):
         by this callback. If you wish to exist in user land, don't worry about
         anything other than the one callback you're required to define.
         """
-        data = self.compute_data(**kwargs)
-        self.__render_data(data)
+        if self.busy:
+            self.pending = kwargs
+            self.dropped += 1
+            if performance_log_enabled():
+                log_event(self.identifier, "drop", f"dropped updates: {self.dropped}")
+            return
+        self.busy = True
+        if self.threaded:
+            QThreadPool.globalInstance().start(ComputeTask(self, kwargs))
+            return
+        try:
+            data = self.compute_data(**kwargs)
+            self.__render_data(data)
+        finally:
+            self.release()
+
+    def on_computed(self, data: Any):
+        """
+        Render the data computed on a worker thread. Executed on the GUI
+        thread once the result has been marshalled back to it.
+
+        :param data: the data returned by the user specified callback
+        """
+        try:
+            self.__render_data(data)
+        finally:
+            self.release()
+
+    def release(self):
+        """
+        Mark the pane as free to accept updates and execute the most recent
+        update dropped while it was busy, if any.
+        """
+        self.busy = False
+        if self.pending is not None:
+            kwargs, self.pending = self.pending, None
+            self.update(**kwargs)
 
     @performance_log(event="compute")
     def compute_data(self, **kwargs):
         """
-        Execute the user specified callback and return the resulting data.
+        Execute the user specified callback and return the resulting data,
+        prepared for rendering (see `prepare_data`).
 
         This function is a general abstraction which exists merely to simplify
         optional performance logging.
         """
-        return self.callback(**kwargs)
+        return self.prepare_data(self.callback(**kwargs))
+
+    def prepare_data(self, data: Any):
+        """
+        Convert the data returned by the user specified callback into the form
+        expected by `render_data`. Executed alongside the callback, and thus on
+        a worker thread when the `threaded` option is enabled, such that costly
+        conversions don't block the GUI thread. Override as needed.
+
+        :param data: the data returned by the user specified callback
+        """
+        return data
 
     @performance_log(event="render")
     def __render_data(self, *args):
@@ -89,17 +216,29 @@ class StatefulPane(LayoutWidget):
         """
         IMPORTANT: A parent method which will fail if not overridden/shadowed.
 
+        NOTE: The data provided is the output of `prepare_data`. Call it first
+        when rendering data returned by the callback directly.
+
         :raises [TODO:name]: [TODO:description]
         """
         raise NotImplementedError
 
-    def force_flush(self):
+    def schedule_flush(self):
+        """
+        Update the pane with the current state once the flush interval
+        elapses. Requests made while an update is already scheduled are folded
+        into it rather than restarting the wait, such that the pane continues
+        to update during a continuous stream of changes.
         """
-        more so here for possible future convenience. don't really have a use
-        for this right now... maybe debugging later? depends on the obnoxious
-        level of inheritance object oriented programming can aspire to.
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
 
+    def force_flush(self):
+        """
+        Synchronously update the pane with the current state, bypassing (and
+        cancelling) any pending deferred update.
         """
+        self.flush_timer.stop()
         self.pane_state.flush()
 
     def enchain(self, widget: StatefulWidget):
@@ -137,17 +276,27 @@ class ImagePane(StatefulPane):
     IMPORTANT: Image data should be normalized and converted to standard bytes
     (uint8). Note the underlying pyqtgraph library supports uint16 and small
     floats, but visualization works best and renders fastest for bytes.
+
+    NOTE: The view, intensity levels, and histogram range are always fit to
+    the first frame rendered (or the first frame following a call to
+    `reset_view`). Subsequent frames only repeat this work when requested via
+    the corresponding constructor flags, as the per-frame reductions over the
+    image data quickly dominate the render time for large images.
     """
 
     displaypane: pg.ImageView
     dargs: Dict
+    first_frame: bool
+    channel_layout: str
 
     def __init__(
         self,
         callback: Callable,
-        autoRange=True,
-        autoLevels=True,
-        autoHistogramRange=True,
+        autoRange=False,
+        autoLevels=False,
+        autoHistogramRange=False,
+        levels: Optional[Tuple[float, float]] = None,
+        channel_layout: str = "interleaved",
         border: Optional[Any] = None,
         **kwargs,
     ) -> None:
@@ -156,22 +305,62 @@ class ImagePane(StatefulPane):
 
         :param callback: A callback function which updates the rendered data.
         :param autoRange: A flag which specifies whether display zoom and panning
-        should be reset on each render. Disable this if you want to focus on a
-        particular set of pixels for any frame to be displayed.
+        should be reset on each render. Leave this disabled if you want to focus
+        on a particular set of pixels for any frame to be displayed.
         :param autoLevels: A flag which specifies whether to update the intensity
-        range when displaying the image (normalization)
+        range on each render (normalization).
         :param autoHistogramRange: flag which specifies whether the histogram
-        widget is scaled to fit the data.
-        """
+        widget is scaled to fit the data on each render.
+        :param levels: An optional (min, max) pair which pins the intensity
+        levels for every frame, disabling `autoLevels`. Use `(0, 255)` for
+        uint8 data as the levels are known ahead of time.
+        :param channel_layout: The memory layout of color images returned by
+        the callback. Either "interleaved" for (H, W, C) arrays or "planar" for
+        (C, H, W) arrays. Planar images are converted to the interleaved layout
+        required for display in a single copy.
+        """
+        assert channel_layout in ("interleaved", "planar"), f"error: unknown channel layout {channel_layout}"
         super().__init__(callback, **kwargs)
-        self.dargs = dict(autoRange=autoRange, autoLevels=autoLevels, autoHistogramRange=autoHistogramRange)
+        self.channel_layout = channel_layout
+        if levels is not None:
+            autoLevels = False
+        self.dargs = dict(
+            autoRange=autoRange, autoLevels=autoLevels, autoHistogramRange=autoHistogramRange, levels=levels
+        )
+        self.first_frame = True
         self.displaypane = pg.ImageView()
         self.addWidget(self.displaypane)
         if border is not None:
             self.set_border(border)
 
+    def prepare_data(self, data: Any):
+        # non-contiguous data (slices, transposes) is copied once here rather
+        # than being copied or walked with large strides within pyqtgraph.
+        # numpy releases the GIL while copying, so for threaded panes the copy
+        # overlaps with work on the GUI thread.
+        image = data
+        if not isinstance(image, np.ndarray):
+            return image
+        if self.channel_layout == "planar" and image.ndim == 3:
+            image = image.transpose(1, 2, 0)
+        if not image.flags.c_contiguous:
+            image = np.ascontiguousarray(image)
+        return image
+
     def render_data(self, *args):
-        self.displaypane.setImage(args[0], **self.dargs)
+        image = args[0]
+        dargs = self.dargs
+        if self.first_frame:
+            dargs = dict(dargs, autoRange=True, autoLevels=dargs["levels"] is None, autoHistogramRange=True)
+            self.first_frame = False
+        self.displaypane.setImage(image, **dargs)
+
+    def reset_view(self):
+        """
+        Fit the view, intensity levels, and histogram range to the data on the
+        next render, as is done for the first frame.
+        """
+        self.first_frame = True
 
     def set_border(self, border: Any):
         """
@@ -221,6 +410,7 @@ class BasePlot2DPane(StatefulPane):
     plot_layout: pg.GraphicsLayoutWidget
     curves: List[PlotDataItem]
     plot_args: Dict
+    sample_indices: NDArray
 
     def __init__(self, callback: Callable, **kwargs) -> None:
         """
@@ -243,6 +433,11 @@ class BasePlot2DPane(StatefulPane):
               shown.
             - `gridy` (bool): A flag which specifies whether the y-axis grid is
               shown.
+            - `finite` (bool): A flag which specifies that the data never
+              contains NaN or inf values, allowing the per-frame scan for such
+              values to be skipped. Defaults to True unless either axis is
+              displayed as a log scale (which maps non-positive values to
+              non-finite ones).
         """
         self.plot_layout = GraphicsLayoutWidget()
         self.plot_item = self.plot_layout.addPlot(title=kwargs.pop("title", None))
@@ -254,10 +449,14 @@ class BasePlot2DPane(StatefulPane):
         if kwargs.pop("legend", False):
             self.plot_item.addLegend()
 
-        self.plot_item.setLogMode(x=kwargs.pop("logx", False), y=kwargs.pop("logy", False))
+        logx, logy = kwargs.pop("logx", False), kwargs.pop("logy", False)
+        self.plot_item.setLogMode(x=logx, y=logy)
         self.plot_item.showGrid(x=kwargs.pop("gridx", False), y=kwargs.pop("gridy", False))
         self.curves = []
         self.plot_args = {}
+        if kwargs.pop("finite", not (logx or logy)):
+            self.plot_args.update(connect="all", skipFiniteCheck=True)
+        self.sample_indices = np.arange(0)
 
         super().__init__(callback, **kwargs)
         self.addWidget(self.plot_layout)
@@ -349,9 +548,17 @@ class BasePlot2DPane(StatefulPane):
         if n_curves != len(self.curves):
             self.reinitialize_curves(n_curves)
 
+        if data.ndim != 2:
+            for i in range(n_curves):
+                self.curves[i].setData(data[i])
+            return
+
+        # reuse the generated x-values rather than having each curve create
+        # its own on every render
+        if self.sample_indices.size != data.shape[1]:
+            self.sample_indices = np.arange(data.shape[1])
         for i in range(n_curves):
-            self.curves[i].setData(data[i])
-            # self.curves[i].setData(data)
+            self.curves[i].setData(x=self.sample_indices, y=data[i])
 
 
 class Plot2DLinePane(BasePlot2DPane):
@@ -1,4 +1,5 @@
-from typing import Callable, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
 
 
 class State:
@@ -13,14 +14,23 @@ class State:
 
     storage: Dict
     onUpdate: Callable
+    onSchedule: Optional[Callable]
 
     def __init__(
         self,
         callback,
         init: Optional[Dict] = None,
+        scheduler: Optional[Callable] = None,
     ) -> None:
+        """
+        :param callback: executed with the contents of the state on flush
+        :param init: optional initial state contents
+        :param scheduler: optional callable used by `schedule_flush` to defer
+        the flush (e.g. starting a timer which later calls `flush`).
+        """
         self.storage = init if init is not None else {}
         self.onUpdate = callback
+        self.onSchedule = scheduler
 
     def __getitem__(self, key):
         return self.storage.get(key)
@@ -34,3 +44,63 @@ class State:
         all state changes to the interface when called.
         """
         self.onUpdate(**self.storage)
+
+    def schedule_flush(self):
+        """
+        Request a flush of the state. When a scheduler was provided, the
+        request is handed off to it such that many rapid changes can be
+        coalesced into a single flush. Otherwise, flush immediately.
+        """
+        if self.onSchedule is None:
+            self.flush()
+        else:
+            self.onSchedule()
+
+
+class ResultCache:
+    """
+    A small least-recently-used cache of callback results keyed on the state
+    the callback was executed with. Control widgets frequently emit values
+    which were seen moments ago (e.g. step quantization or a user wiggling a
+    slider), and for such states the callback need not be executed again.
+
+    IMPORTANT: Results are held in memory until evicted, so keep `maxsize`
+    small when the callback returns large arrays. States containing an
+    `animation_tick` (which advances monotonically) or unhashable values
+    bypass the cache.
+
+    IMPORTANT: Only use with callbacks which are free of side effects and
+    return new data on each call. A callback which writes into a reused buffer
+    would invalidate the results held for other states.
+    """
+
+    maxsize: int
+    entries: OrderedDict
+
+    def __init__(self, callback: Callable, maxsize: int = 8) -> None:
+        """
+        :param callback: the callback whose results are cached
+        :param maxsize: the maximum number of results held
+        """
+        self.callback = callback
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def __call__(self, **kwargs) -> Any:
+        if "animation_tick" in kwargs:
+            return self.callback(**kwargs)
+        try:
+            key = tuple(sorted(kwargs.items()))
+            hit = key in self.entries
+        except TypeError:
+            return self.callback(**kwargs)
+
+        if hit:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        result = self.callback(**kwargs)
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
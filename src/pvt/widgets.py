@@ -69,7 +69,7 @@ class StatefulWidget(LayoutWidget):
             x[self.key] = value
 
         for x in self.states:
-            x.flush()
+            x.schedule_flush()
 
 
 class ParameterToggle(StatefulWidget):
@@ -1,4 +1,4 @@
-from pytest import fixture, raises
+from pytest import fixture, mark, raises
 from pvt.panels import BasePlot2DPane, ImagePane, Plot2DLinePane, Plot2DScatterPane, Plot3DPane, StatefulPane
 from pvt.widgets import ParameterTrackbar
 import numpy as np
@@ -92,6 +92,80 @@ class TestStatefulPane:
             with raises(NotImplementedError):
                 bench_fpane.force_flush()
 
+    def test_flush_interval(self, qtbot, fpane, trackbar):
+        if type(self) != TestStatefulPane:
+            fpane.enchain(trackbar)
+            for x in range(10):
+                trackbar.state_update(x)
+            assert fpane.callback.call_count == 0
+            qtbot.waitUntil(lambda: fpane.callback.call_count == 1)
+            assert fpane.callback.call_args.kwargs == dict(slide=9)
+
+    def test_flush_interval_throttle(self, qtbot, fpane, trackbar):
+        if type(self) != TestStatefulPane:
+            fpane.enchain(trackbar)
+            for x in range(20):
+                trackbar.state_update(x)
+                qtbot.wait(4)
+            # a continuous stream of changes must not postpone every update
+            assert fpane.callback.call_count > 1
+
+    def test_threaded(self, qtbot, mocker):
+        if type(self) != TestStatefulPane:
+            widget = self.targ_class(callback=lambda **_: self.cback_ret, threaded=True)
+            qtbot.addWidget(widget)
+            spy = mocker.spy(widget, "render_data")
+            widget.force_flush()
+            qtbot.waitUntil(lambda: spy.call_count == 1)
+            assert not widget.busy
+
+    @mark.qt_no_exception_capture
+    def test_threaded_abandoned(self, qtbot, mocker):
+        if type(self) != TestStatefulPane:
+            cback = mocker.Mock(side_effect=[RuntimeError("callback failure"), self.cback_ret])
+            widget = self.targ_class(callback=cback, threaded=True)
+            qtbot.addWidget(widget)
+            spy = mocker.spy(widget, "render_data")
+            widget.force_flush()
+            qtbot.waitUntil(lambda: not widget.busy)
+            assert spy.call_count == 0
+            widget.force_flush()
+            qtbot.waitUntil(lambda: spy.call_count == 1)
+            assert cback.call_count == 2
+
+    def test_on_computed(self, fpane):
+        fpane.busy = True
+        if type(self) != TestStatefulPane:
+            fpane.on_computed(self.cback_ret)
+        else:
+            with raises(NotImplementedError):
+                fpane.on_computed(self.cback_ret)
+        assert not fpane.busy
+
+    def test_drop_while_busy(self, fpane):
+        fpane.busy = True
+        fpane.update(slide=1)
+        fpane.update(slide=2)
+        assert fpane.callback.call_count == 0
+        assert fpane.dropped == 2
+        if type(self) != TestStatefulPane:
+            fpane.release()
+        else:
+            with raises(NotImplementedError):
+                fpane.release()
+        assert fpane.callback.call_count == 1
+        assert fpane.callback.call_args.kwargs == dict(slide=2)
+        assert not fpane.busy and fpane.pending is None
+
+    def test_memoize(self, qtbot, mocker):
+        if type(self) != TestStatefulPane:
+            cback = mocker.Mock(side_effect=lambda **_: self.cback_ret.copy())
+            widget = self.targ_class(callback=cback, memoize=2)
+            qtbot.addWidget(widget)
+            for x in (1, 2, 1):
+                widget.update(slide=x)
+            assert cback.call_count == 2
+
     def test_enchain(self, fpane, trackbar):
         fpane.enchain(trackbar)
         assert fpane.pane_state in trackbar.states
@@ -118,12 +192,57 @@ class TestImagePane(TestStatefulPane):
     targ_class = ImagePane
     cback_ret = np.arange(16).reshape(4, 4)
 
+    def test_reset_view(self, fpane):
+        assert fpane.first_frame
+        fpane.force_flush()
+        assert not fpane.first_frame
+        fpane.reset_view()
+        assert fpane.first_frame
+
+    def test_prepare_data(self, fpane):
+        image = fpane.prepare_data(self.cback_ret.T)
+        assert image.flags.c_contiguous
+        assert (image == self.cback_ret.T).all()
+
+    def test_prepare_data_passthrough(self, qtbot):
+        widget = self.targ_class(callback=lambda **_: self.cback_ret, channel_layout="planar")
+        qtbot.addWidget(widget)
+        assert widget.prepare_data([[0, 1]]) == [[0, 1]]
+
+    def test_channel_layout_planar(self, qtbot):
+        planar = np.arange(60, dtype=np.uint8).reshape(3, 4, 5)
+        widget = self.targ_class(callback=lambda **_: planar, channel_layout="planar")
+        qtbot.addWidget(widget)
+        widget.force_flush()
+        assert widget.displaypane.image.shape == (4, 5, 3)
+        assert widget.displaypane.image.flags.c_contiguous
+        assert widget.displaypane.axes["c"] == 2
+
+    def test_levels(self, qtbot):
+        widget = self.targ_class(callback=lambda **_: self.cback_ret, levels=(0, 255))
+        qtbot.addWidget(widget)
+        widget.force_flush()
+        assert widget.displaypane.ui.histogram.getLevels() == (0, 255)
+
 
 class TestBasePlot2DPane(TestStatefulPane):
 
     targ_class = BasePlot2DPane
     cback_ret = np.arange(100).reshape(-1, 2)
 
+    def test_finite(self, qtbot, fpane):
+        assert fpane.plot_args["skipFiniteCheck"]
+        widget = self.targ_class(callback=lambda **_: self.cback_ret, logy=True)
+        qtbot.addWidget(widget)
+        assert "skipFiniteCheck" not in widget.plot_args
+
+    def test_sample_indices(self, fpane):
+        fpane.render_data(np.zeros((3, 10)))
+        indices = fpane.sample_indices
+        fpane.render_data(np.ones((3, 10)))
+        assert fpane.sample_indices is indices
+        assert (fpane.curves[0].xData == np.arange(10)).all()
+
     def test_plot_tailored(self, fpane):
         fpane.plot(i=1)
 
@@ -1,6 +1,7 @@
-from pvt import State
+from pvt import ResultCache, State
 from pytest import fixture
 from copy import deepcopy
+import numpy as np
 
 
 class TestState:
@@ -44,3 +45,45 @@ class TestState:
         # benchmark
         state = State(callback=lambda **_: None, init=self.init_storage)
         benchmark(state.flush)
+
+    def test_schedule_flush(self, mocker):
+        mock = mocker.Mock()
+        state = State(callback=mock, init=self.init_storage)
+        state.schedule_flush()
+        assert mock.call_count == 1
+
+        scheduler = mocker.Mock()
+        state = State(callback=mock, init=self.init_storage, scheduler=scheduler)
+        state.schedule_flush()
+        assert scheduler.call_count == 1
+        assert mock.call_count == 1
+
+
+class TestResultCache:
+
+    def test_hit(self, mocker):
+        mock = mocker.Mock(side_effect=lambda **_: np.zeros(4))
+        cache = ResultCache(mock, maxsize=2)
+        first = cache(a=1, b=2)
+        assert cache(b=2, a=1) is first
+        assert mock.call_count == 1
+
+    def test_eviction(self, mocker):
+        mock = mocker.Mock(side_effect=lambda **_: np.zeros(4))
+        cache = ResultCache(mock, maxsize=2)
+        for x in range(3):
+            cache(a=x)
+        assert len(cache.entries) == 2
+        cache(a=2)
+        assert mock.call_count == 3
+        cache(a=0)
+        assert mock.call_count == 4
+
+    def test_bypass(self, mocker):
+        mock = mocker.Mock(side_effect=lambda **_: np.zeros(4))
+        cache = ResultCache(mock)
+        cache(a=1, animation_tick=0)
+        cache(a=1, animation_tick=0)
+        cache(a=[1])
+        assert mock.call_count == 3
+        assert len(cache.entries) == 0